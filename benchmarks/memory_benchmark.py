@@ -0,0 +1,73 @@
+"""
+Measures the memory footprint of many editors opened in notebook tabs, with and
+without the low_memory option. Python allocations are measured with tracemalloc,
+and the Tk side is described by the number of fonts, tags, tag ranges and marks
+
+Usage (from the repository root): python -m benchmarks.memory_benchmark [tabs]
+"""
+
+import os
+import sys
+import tkinter as tk
+import tracemalloc
+from tkinter import ttk
+
+from tkcode import CodeEditor
+
+file_name = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "..", "tkcode", "codebox.py"
+)
+
+
+def tk_counts(root: tk.Tk, editors: list) -> dict:
+    tag_ranges = 0
+    for editor in editors:
+        for tag in editor.tag_names():
+            tag_ranges += len(editor.tag_ranges(tag)) // 2
+
+    return {
+        "fonts": len(root.tk.splitlist(root.tk.call("font", "names"))),
+        "tags": sum(len(editor.tag_names()) for editor in editors),
+        "tag ranges": tag_ranges,
+        "marks": sum(len(editor.mark_names()) for editor in editors),
+    }
+
+
+def measure(tabs: int, low_memory: bool) -> None:
+    root = tk.Tk()
+    notebook = ttk.Notebook(root)
+    notebook.pack(fill="both", expand=True)
+
+    tracemalloc.start()
+    editors = []
+    for index in range(tabs):
+        tab = ttk.Frame(notebook)
+        notebook.add(tab, text=f"tab {index}")
+        editor = CodeEditor(tab, language="python", low_memory=low_memory)
+        editor.pack(fill="both", expand=True)
+        editor.load_from_file(file_name)
+        editors.append(editor)
+
+    # Show every tab once, like a user going through them
+    for tab in notebook.tabs():
+        notebook.select(tab)
+        root.update()
+
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"low_memory={low_memory}, {tabs} tabs")
+    print(f"  python: {current / 2**20:.1f} MiB (peak {peak / 2**20:.1f} MiB)")
+    for name, count in tk_counts(root, editors).items():
+        print(f"  {name}: {count}")
+
+    root.destroy()
+
+
+def main(tabs: int = 200) -> None:
+    for low_memory in (False, True):
+        measure(tabs, low_memory)
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:2]))
@@ -0,0 +1,96 @@
+"""
+Compares the throughput of the built-in regex tokenizers with Pygments
+on the same inputs. The text is tokenized line by line, like the widgets do
+
+Usage (from the repository root): python -m benchmarks.tokenizer_benchmark [repeat]
+"""
+
+import glob
+import json
+import os
+import sys
+import timeit
+
+from pygments.lexers import CLexer, JsonLexer, PythonLexer, YamlLexer
+
+from tkcode.tokenizers import REGEX_TOKENIZERS, PygmentsTokenizer
+
+package_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "tkcode")
+
+
+def python_input() -> str:
+    with open(os.path.join(package_path, "codebox.py")) as file:
+        return file.read()
+
+
+def json_input() -> str:
+    content = []
+    for file_name in sorted(glob.glob(os.path.join(package_path, "schemes", "*"))):
+        with open(file_name) as file:
+            content.append(file.read())
+    return "\n".join(content)
+
+
+def yaml_input() -> str:
+    lines = ["---"]
+    for file_name in sorted(glob.glob(os.path.join(package_path, "schemes", "*"))):
+        with open(file_name) as file:
+            scheme = json.load(file)
+        lines.append(f"{os.path.basename(file_name)}:  # color scheme")
+        for section, values in scheme.items():
+            lines.append(f"  {section}:")
+            for key, value in values.items():
+                lines.append(f"    - &{key.replace('.', '-')} {key}: {value!r}")
+    return "\n".join(lines * 5)
+
+
+def c_input() -> str:
+    return """#include <stdio.h>
+
+/* Prints a greeting a few times */
+static unsigned int greet(const char *name, int times) {
+    for (int i = 0; i < times; i++) {
+        printf("Hello %s! %d\\n", name, i * 0x10 + 3.5f);  // greeting
+    }
+    return times > 0 ? 1u : 0;
+}
+""" * 200
+
+
+INPUTS = {
+    PythonLexer: python_input(),
+    JsonLexer: json_input(),
+    YamlLexer: yaml_input(),
+    CLexer: c_input(),
+}
+
+
+def tokenize_lines(tokenizer, lines) -> None:
+    for line in lines:
+        for _ in tokenizer.tokenize(line):
+            pass
+
+
+def main(repeat: int = 5) -> None:
+    print(f"{'language':<10} {'pygments':>14} {'regex':>14} {'speedup':>8}")
+
+    for lexer, content in INPUTS.items():
+        lines = content.splitlines()
+        results = []
+        for tokenizer in (PygmentsTokenizer(lexer), REGEX_TOKENIZERS[lexer]):
+            tokenize_lines(tokenizer, lines)  # Warm up
+            best = min(
+                timeit.repeat(
+                    lambda: tokenize_lines(tokenizer, lines), number=1, repeat=repeat
+                )
+            )
+            results.append(len(content) / best / 1_000_000)
+
+        print(
+            f"{lexer.name:<10} {results[0]:>9.2f} MB/s {results[1]:>9.2f} MB/s"
+            f" {results[1] / results[0]:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:2]))
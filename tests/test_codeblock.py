@@ -2,12 +2,21 @@
 A really simple test file for the most important features I need to test
 """
 
+import os
+import tempfile
+import tkinter as tk
 import unittest
 
-from tkcode import CodeBlock
+from tkcode import CodeBlock, codebox
 
 
 class TestCodeBlock(unittest.TestCase):
+    def setUp(self):
+        self.root = tk.Tk()
+
+    def tearDown(self):
+        self.root.destroy()
+
     def test_codeblock_init(self):
         widget = CodeBlock()
         widget.pack()
@@ -39,6 +48,117 @@ class TestCodeBlock(unittest.TestCase):
         widget.configure(language="brainfuck")
         self.assertEqual(widget.cget("language"), "brainfuck")
 
+    def test_batch(self):
+        widget = CodeBlock(self.root, undo=True)
+        widget.insert("end", "y = 2\n")
+        before = widget.content
+        events = []
+        widget.bind("<<ContentChanged>>", events.append)
+        with widget.batch():
+            for _ in range(100):
+                widget.insert("end", "x = 1\n")
+            widget.delete("1.0", "2.0")
+            self.assertEqual(widget["state"], "normal")
+            self.assertEqual(widget.tag_ranges("Token.Name"), ())
+        widget.update()
+        self.assertEqual(widget["state"], "disabled")
+        self.assertEqual(widget.number_of_lines, 101)
+        self.assertEqual(len(events), 1)
+        self.assertNotEqual(widget.tag_ranges("Token.Name"), ())
+        self.assertNotIn("batch_dirty", widget.tag_names())
+
+        # The whole batch is a single undo step
+        widget.config(state="normal")
+        widget.edit_undo()
+        self.assertEqual(widget.content, before)
+
+    def test_highlight_limit(self):
+        widget = CodeBlock(self.root, language="json", highlight_limit=100)
+        self.assertEqual(widget["highlight_limit"], 100)
+        widget.content = '{"a": 1}, ' * 1000
+        widget.highlight_line(line=1)
+        self.assertEqual(
+            tuple(map(str, widget.tag_ranges("highlight_cutoff"))), ("1.100", "1.10000")
+        )
+        widget.configure(highlight_limit=0)
+        self.assertEqual(widget.tag_ranges("highlight_cutoff"), ())
+
+    def test_apply_diff(self):
+        widget = CodeBlock(self.root)
+        widget.content = "a = 1\nb = 2\nc = 3"
+        widget.apply_diff("a = 1\nbb = 2\nc = 3\nd = 4")
+        self.assertEqual(widget.content, "a = 1\nbb = 2\nc = 3\nd = 4\n")
+        widget.apply_diff("c = 3")
+        self.assertEqual(widget.content, "c = 3\n")
+        self.assertEqual(widget["state"], "disabled")
+
+    def test_watch_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            file_name = os.path.join(directory, "watched.py")
+            with open(file_name, "w") as file:
+                file.write("a = 1\nb = 2\n")
+
+            widget = CodeBlock(self.root)
+            events = []
+            widget.bind("<<FileChangedOnDisk>>", events.append)
+            widget.watch_file(file_name)
+
+            with open(file_name, "w") as file:
+                file.write("a = 1\nbb = 2\nc = 3\n")
+            widget._poll_file(1000)
+            widget.update()
+            self.assertEqual(
+                widget.get("1.0", "end - 1 char"), "a = 1\nbb = 2\nc = 3\n"
+            )
+            self.assertEqual(len(events), 1)
+
+            # Saving to the same file through another path isn't a change on disk
+            widget.save_to_file(os.path.relpath(file_name))
+            widget._poll_file(1000)
+            widget.update()
+            self.assertEqual(len(events), 1)
+            widget.unwatch_file()
+
+    def test_low_memory(self):
+        first = CodeBlock(self.root, low_memory=True)
+        second = CodeBlock(self.root, low_memory=True)
+        self.assertTrue(first["low_memory"])
+        self.assertIs(first._font, second._font)
+        first.font_size = 20
+        self.assertIsNot(first._font, second._font)
+        self.assertNotEqual(second.font_size, 20)
+        self.assertEqual(first.font_family, second.font_family)
+
+    def test_low_memory_cleanup(self):
+        root = tk.Tk()
+        CodeBlock(root, low_memory=True)
+        self.assertIn(root.tk, codebox._shared_fonts)
+        root.destroy()
+        self.assertNotIn(root.tk, codebox._shared_fonts)
+
+        master = tk.Frame(self.root)
+        first = CodeBlock(master, low_memory=True)
+        second = CodeBlock(master, low_memory=True)
+        first.destroy()
+        self.assertEqual(master.bind("<Map>").count("_on_map"), 1)
+        second.destroy()
+        self.assertEqual(master.bind("<Map>").strip(), "")
+        self.assertEqual(master.winfo_children(), [])
+
+    def test_unload_highlighting(self):
+        widget = CodeBlock(self.root, language="python", low_memory=True)
+        widget.reload_highlighting()
+        widget.content = "def f(x):\n    return x"
+        widget.highlight_all()
+        # Token.Name has no style in the scheme, so it isn't tagged
+        self.assertNotEqual(widget.tag_ranges("Token.Keyword"), ())
+        self.assertEqual(widget.tag_ranges("Token.Name"), ())
+
+        widget.unload_highlighting()
+        self.assertEqual(widget.tag_ranges("Token.Keyword"), ())
+        widget.reload_highlighting()
+        self.assertNotEqual(widget.tag_ranges("Token.Keyword"), ())
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,35 @@
+"""
+Tests for the helpers in the codebox module that don't need a widget
+"""
+
+import unittest
+
+from pygments.lexers import CMakeLexer, PythonLexer, TextLexer
+
+from tkcode import codebox
+
+
+class TestDetectLexer(unittest.TestCase):
+    def test_file_name(self):
+        self.assertIs(codebox.detect_lexer("script.py"), PythonLexer)
+        self.assertIs(codebox.detect_lexer("notes.txt"), TextLexer)
+        # Cached by extension, but special file names must not be affected
+        self.assertIs(codebox.detect_lexer("CMakeLists.txt"), CMakeLexer)
+
+    def test_content_sample(self):
+        content = "#!/usr/bin/env python\nimport os\n" * 10000
+        self.assertIs(codebox.detect_lexer("script", content), PythonLexer)
+        # Cached per path, the content isn't looked at again
+        self.assertIs(codebox.detect_lexer("script", ""), PythonLexer)
+
+    def test_unknown(self):
+        self.assertIsNone(codebox.detect_lexer("data.unknownextension"))
+        self.assertIn(".unknownextension", codebox._lexers_by_extension)
+        codebox.detect_lexer("other.unknownextension", "\x00")
+        self.assertIn(
+            codebox.os.path.abspath("other.unknownextension"), codebox._lexers_by_path
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,84 @@
+"""
+Tests for the autocompletion of the code editor
+"""
+
+import re
+import tkinter as tk
+import unittest
+
+from tkcode import CodeEditor
+
+
+class TestCodeEditor(unittest.TestCase):
+    def setUp(self):
+        self.root = tk.Tk()
+
+    def tearDown(self):
+        self.root.destroy()
+
+    def make_editor(self, text: str) -> CodeEditor:
+        editor = CodeEditor(self.root)
+        tk.Text.insert(editor, "1.0", text)
+        self.highlight_lines(editor, 1, text.count("\n") + 1)
+        return editor
+
+    def highlight_lines(self, editor: CodeEditor, first: int, last: int):
+        # Like the editor does with the lines touched by an edit
+        for line in range(first, last + 1):
+            editor.highlight_line(line=line)
+
+    def assert_index_matches(self, editor: CodeEditor):
+        words = set(re.findall(r"\bv\w+", editor.get("1.0", "end")))
+        self.assertEqual(sorted(editor.completions("v", limit=100)), sorted(words))
+
+    def test_insert_lines_in_the_middle(self):
+        editor = self.make_editor("va = 1\nvb = 2\nvc = 3\nvd = 4\n")
+        self.assert_index_matches(editor)
+        tk.Text.insert(editor, "2.2", "x\nve = 5\nvf")
+        self.highlight_lines(editor, 2, 4)
+        self.assertEqual(editor.get("2.0", "5.0"), "vbx\nve = 5\nvf = 2\n")
+        self.assert_index_matches(editor)
+
+    def test_delete_lines(self):
+        editor = self.make_editor("va = 1\nvb = 2\nvc = 3\nvd = 4\n")
+        editor.delete("2.1", "3.1")
+        self.highlight_lines(editor, 2, 2)
+        self.assertEqual(editor.get("2.0", "2.end"), "vc = 3")
+        self.assert_index_matches(editor)
+
+        editor.delete("1.0", "end")
+        self.highlight_lines(editor, 1, 1)
+        self.assertEqual(editor.completions("v"), [])
+
+    def test_replace(self):
+        editor = self.make_editor("va = 1\nvb = 2\nvc = 3\n")
+        editor.replace("1.0", "2.0", "vx = 1\nvy = 2\n")
+        self.highlight_lines(editor, 1, 3)
+        self.assertEqual(editor.get("1.0", "end"), "vx = 1\nvy = 2\nvb = 2\nvc = 3\n\n")
+        self.assert_index_matches(editor)
+
+    def show_popup(self) -> CodeEditor:
+        editor = self.make_editor("values = 1\nreturn value")
+        editor.pack()
+        editor.mark_set("insert", "2.end")
+        editor.focus_force()
+        self.root.update()
+        editor.show_completions()
+        self.assertTrue(editor.completion_popup.is_visible)
+        return editor
+
+    def test_return_inserts_newline(self):
+        editor = self.show_popup()
+        editor.event_generate("<Return>")
+        self.assertEqual(editor.get("2.0", "end - 1 char"), "return value\n")
+        self.assertFalse(editor.completion_popup.is_visible)
+
+    def test_return_inserts_chosen_completion(self):
+        editor = self.show_popup()
+        editor.event_generate("<Down>")
+        editor.event_generate("<Return>")
+        self.assertEqual(editor.get("2.0", "end - 1 char"), "return values")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,48 @@
+"""
+Tests for the identifier index used by the autocompletion
+"""
+
+import unittest
+
+from tkcode.completion import IdentifierIndex
+
+
+class TestIdentifierIndex(unittest.TestCase):
+    def test_complete(self):
+        index = IdentifierIndex()
+        index.update_line(1, ["foo", "foobar", "print"])
+        index.update_line(2, ["foobar", "fizz"])
+        self.assertEqual(index.complete("f"), ["foobar", "fizz", "foo"])
+        self.assertEqual(index.complete("f", limit=1), ["foobar"])
+        self.assertEqual(index.complete("foo"), ["foobar"])
+        self.assertEqual(index.complete("x"), [])
+
+    def test_update_line(self):
+        index = IdentifierIndex()
+        index.update_line(1, ["foo", "bar"])
+        index.update_line(2, ["foo"])
+        index.update_line(1, ["baz"])
+        self.assertIn("foo", index)
+        self.assertNotIn("bar", index)
+        index.update_line(2, [])
+        self.assertNotIn("foo", index)
+        self.assertEqual(len(index), 1)
+
+    def test_insert_and_delete_lines(self):
+        index = IdentifierIndex()
+        for line, word in enumerate(["a", "b", "c"], start=1):
+            index.update_line(line, [word])
+
+        index.insert_lines(1, 2)  # Two new lines after "a"
+        index.update_line(4, ["bb"])  # "b" moved to line 4
+        self.assertNotIn("b", index)
+        self.assertIn("c", index)
+
+        index.delete_lines(1, 3)  # Lines 2-4 merged into line 1
+        self.assertEqual(sorted(index.complete("")), ["a", "c"])
+        index.update_line(2, [])
+        self.assertNotIn("c", index)
+
+
+if __name__ == "__main__":
+    unittest.main()
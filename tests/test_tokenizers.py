@@ -0,0 +1,72 @@
+"""
+Tests for the tokenizer backends
+"""
+
+import unittest
+
+from pygments.lexers import CLexer, JsonLexer, PythonLexer, YamlLexer
+from pygments.token import Comment, Keyword, Name, Number, Punctuation, String
+
+from tkcode.tokenizers import REGEX_TOKENIZERS, PygmentsTokenizer
+
+SAMPLES = {
+    PythonLexer: (
+        'from os import path\n@dec\ndef f(self, x=1.5):\n    return r"a"  # c\n'
+        "class A:\n    def __init__(self):\n        self.attr = obj.attr\n"
+        "        t.__init__(s.format(obj.type), __name__, __file__)\n"
+        "match re.match(x, y):\n    case [match]:\n        case = match\n"
+    ),
+    JsonLexer: '{"a": [1, 2.5, true, "s"], "b": null}\n',
+    YamlLexer: "---\nkey: value  # c\nlist:\n  - &a 'item'\n  - *a\n",
+    CLexer: (
+        '#include <stdio.h>\nint main(void) { return printf("%d", 0x1F); }\n'
+        "int f(int a, int b, int c) { return a ? b : c; }\n"
+    ),
+}
+
+
+def char_tokens(tokens) -> list:
+    """Returns the token type of every character"""
+    return [token for token, value in tokens for _ in value]
+
+
+class TestRegexTokenizers(unittest.TestCase):
+    def test_covers_text(self):
+        for lexer, sample in SAMPLES.items():
+            values = [value for _, value in REGEX_TOKENIZERS[lexer].tokenize(sample)]
+            self.assertEqual("".join(values), sample)
+
+    def test_matches_pygments_tokens(self):
+        for lexer, sample in SAMPLES.items():
+            expected = char_tokens(PygmentsTokenizer(lexer).tokenize(sample))
+            actual = char_tokens(REGEX_TOKENIZERS[lexer].tokenize(sample))
+            # Pygments splits strings and preprocessor lines into more tokens
+            compared = [
+                index
+                for index, char in enumerate(sample)
+                if not char.isspace()
+                and not any(
+                    token in String or token in Comment
+                    for token in (expected[index], actual[index])
+                )
+            ]
+            self.assertEqual(
+                [(index, sample[index], actual[index]) for index in compared],
+                [(index, sample[index], expected[index]) for index in compared],
+            )
+
+    def test_python(self):
+        tokens = list(REGEX_TOKENIZERS[PythonLexer].tokenize("def foo(): return 0x1f"))
+        self.assertIn((Name.Function, "foo"), tokens)
+        self.assertIn((Keyword, "return"), tokens)
+        self.assertIn((Number.Hex, "0x1f"), tokens)
+
+    def test_json_keys(self):
+        tokens = list(REGEX_TOKENIZERS[JsonLexer].tokenize('{"key" : "value"}'))
+        self.assertIn((Name.Tag, '"key"'), tokens)
+        self.assertIn((Punctuation, ":"), tokens)
+        self.assertIn((String.Double, '"value"'), tokens)
+
+
+if __name__ == "__main__":
+    unittest.main()
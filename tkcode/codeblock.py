@@ -5,6 +5,7 @@ Copyright: 2021 rdbende
 """
 
 import tkinter as tk
+from contextlib import contextmanager
 
 from . import codebox
 
@@ -27,12 +28,26 @@ class CodeBlock(codebox.BaseCodeBox):
 
     def disabler(func):
         def wrapper(self, *args, **kwargs):
+            if self._batch_depth:
+                # The state is already normal for the whole batch
+                return func(self, *args, **kwargs)
             codebox.BaseCodeBox.config(self, state="normal")
             func(self, *args, **kwargs)
             codebox.BaseCodeBox.config(self, state="disabled")
 
         return wrapper
 
+    @contextmanager
+    def batch(self):
+        if not self._batch_depth:
+            codebox.BaseCodeBox.config(self, state="normal")
+        try:
+            with codebox.BaseCodeBox.batch(self):
+                yield self
+        finally:
+            if not self._batch_depth:
+                codebox.BaseCodeBox.config(self, state="disabled")
+
     @disabler
     def insert(self, *args, **kwargs):
         codebox.BaseCodeBox.insert(self, *args, **kwargs)
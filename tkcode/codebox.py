@@ -4,15 +4,103 @@ License: GNU GPLv3
 Copyright: 2021 rdbende
 """
 
+import difflib
+import fnmatch
 import json
 import os
+import re
 import tkinter as tk
+from contextlib import contextmanager
 from tkinter import font as tkfont
 from tkinter import ttk
 from typing import Union
 
 import pygments
 from pygments.lexers import *
+from pygments.lexers import LEXERS, find_lexer_class_for_filename
+from pygments.token import Name
+from pygments.util import ClassNotFound
+
+from . import tokenizers
+
+# guess_lexer runs every lexer's analyser on the text, so it only gets a sample
+GUESS_SAMPLE_SIZE = 2048
+
+_lexers_by_path = {}
+_lexers_by_extension = {}
+_special_file_names = None
+
+# Shared by every widget, so many open editors don't keep copies of the same data
+_schemes = {}
+_syntax_options = {}
+_shared_fonts = {}  # Font objects by font description, per Tk interpreter
+
+
+def _forget_shared_fonts(event: tk.Event) -> None:
+    if str(event.widget) == ".":
+        _shared_fonts.pop(event.widget.tk, None)
+
+
+def _is_special_file_name(file_name: str) -> bool:
+    """
+    Tells if a file name matches a Pygments pattern other than a plain '*.ext',
+    eg: 'CMakeLists.txt' or 'Makefile.*'. These can't be cached by extension
+    """
+    global _special_file_names
+
+    if _special_file_names is None:
+        patterns = {
+            pattern
+            for *_, file_names, _ in LEXERS.values()
+            for pattern in file_names
+            if not re.fullmatch(r"\*\.[^*?\[\].]+", pattern)
+        }
+        _special_file_names = re.compile(
+            "|".join(fnmatch.translate(pattern) for pattern in patterns)
+        )
+
+    return bool(_special_file_names.match(file_name))
+
+
+def detect_lexer(file_name: Union[str, None] = None, content: str = ""):
+    """
+    Finds the Pygments lexer class for a file by its name, or if that fails,
+    guesses it from the first few kilobytes of the content. Returns None if
+    neither works. Results, including failed lookups, are cached per path and
+    per extension
+    """
+    path = os.path.abspath(file_name) if file_name else None
+    if path in _lexers_by_path:
+        return _lexers_by_path[path]
+
+    lexer = None
+
+    if file_name:
+        base_name = os.path.basename(file_name)
+        extension = os.path.splitext(base_name)[1]
+        if extension and not _is_special_file_name(base_name):
+            if extension not in _lexers_by_extension:
+                _lexers_by_extension[extension] = find_lexer_class_for_filename(
+                    base_name
+                )
+            lexer = _lexers_by_extension[extension]
+        else:
+            lexer = find_lexer_class_for_filename(base_name)
+
+    if lexer is None and content:
+        sample = content[:GUESS_SAMPLE_SIZE]
+        if len(content) > GUESS_SAMPLE_SIZE and "\n" in sample:
+            sample = sample[: sample.rindex("\n")]  # Don't cut a line in half
+        try:
+            lexer = type(guess_lexer(sample))
+        except ClassNotFound:
+            pass
+
+    # A failed lookup is only final if there was content to guess from
+    if path and (lexer is not None or content):
+        _lexers_by_path[path] = lexer
+
+    return lexer
 
 
 class BaseCodeBox(tk.Text):
@@ -69,6 +157,12 @@ class BaseCodeBox(tk.Text):
     ) -> None:
         kwargs.update({"wrap": "none"})
 
+        self._highlight_limit = kwargs.pop("highlight_limit", 10000)
+        self._low_memory = kwargs.pop("low_memory", False)
+        self._tokenizer_backend = self._check_tokenizer_backend(
+            kwargs.pop("tokenizer", "pygments")
+        )
+
         tab_length = kwargs.pop("tabs", "4ch")
         if tab_length[-2:] == "ch":
             tab_length = int(tab_length[:-2])
@@ -82,7 +176,12 @@ class BaseCodeBox(tk.Text):
 
         tk.Text.grid(self, row=0, column=0, sticky="nsew")
 
-        self._font = tkfont.Font(font=kwargs.pop("font", ("monospace", 10)))
+        font = kwargs.pop("font", ("monospace", 10))
+        if self._low_memory:
+            self._font = self._get_shared_font(font)
+        else:
+            self._font = tkfont.Font(font=font)
+        self._font_is_shared = self._low_memory
         tab = self._font.measure(" " * tab_length)
 
         self.configure(font=self._font, tabs=tab)
@@ -90,6 +189,13 @@ class BaseCodeBox(tk.Text):
         self.frame.grid_columnconfigure(0, weight=1)
 
         self._highlighter, self._language = None, None
+        self._batch_depth, self._batch_changed = 0, False
+        self._file_name = None
+        self._watch_job, self._watch_stat = None, None
+        self._identifier_index = None  # Only CodeEditor has one
+        self._styled_tags = frozenset()
+        # In low memory mode highlighting is built when the widget is first shown
+        self._highlighting_unloaded = self._low_memory
 
         self.update_lexer(language)  # Order is important!
         self.update_highlighter(highlighter)
@@ -98,21 +204,186 @@ class BaseCodeBox(tk.Text):
         self.tk.call("rename", self._w, self._orig)
         self.tk.createcommand(self._w, self._proxy)
 
+        self._map_bindings = []
+        if self._low_memory:
+            # Hidden notebook tabs don't need their highlighting
+            for widget in {self.frame, master}:
+                if widget is not self.winfo_toplevel():
+                    for sequence, func in (
+                        ("<Unmap>", self._on_unmap),
+                        ("<Map>", self._on_map),
+                    ):
+                        funcid = widget.bind(sequence, func, add=True)
+                        self._map_bindings.append((widget, sequence, funcid))
+
         if autofocus:
             self.focus()
 
+    def _get_shared_font(self, font) -> tkfont.Font:
+        fonts = _shared_fonts.get(self.tk)
+        if fonts is None:
+            # The fonts would keep the interpreter alive after its root is gone
+            fonts = _shared_fonts[self.tk] = {}
+            self._root().bind("<Destroy>", _forget_shared_fonts, add=True)
+
+        if str(font) not in fonts:
+            fonts[str(font)] = tkfont.Font(root=self, font=font)
+        return fonts[str(font)]
+
+    def _unshare_font(self) -> None:
+        """Copies the shared font before changing it, so others aren't affected"""
+        if self._font_is_shared:
+            self._font = self._font.copy()
+            self._font_is_shared = False
+            tk.Text.configure(self, font=self._font)
+
+    def _unbind_map_events(self) -> None:
+        """Removes the low memory mode bindings, so the master won't keep us alive"""
+        for widget, sequence, funcid in self._map_bindings:
+            if widget.winfo_exists():
+                # Misc.unbind would remove the bindings of other widgets too
+                script = widget.bind(sequence)
+                lines = [line for line in script.split("\n") if funcid not in line]
+                widget.bind(sequence, "\n".join(lines))
+                widget.deletecommand(funcid)
+        self._map_bindings.clear()
+
+    def _on_unmap(self, *_) -> None:
+        if self.winfo_exists():
+            self.unload_highlighting()
+
+    def _on_map(self, *_) -> None:
+        if self.winfo_exists() and self.winfo_viewable():
+            self.reload_highlighting()
+
+    def unload_highlighting(self) -> None:
+        """
+        Removes the highlighting to free the memory of its tags, eg. when the
+        widget is hidden. The highlighting is skipped until reload_highlighting
+        """
+        for tag in self.tag_names(index=None):
+            if tag != "sel":
+                self.tag_remove(tag, "1.0", "end")
+        self._highlighting_unloaded = True
+
+    def reload_highlighting(self) -> None:
+        """Highlights everything again if the highlighting was unloaded"""
+        if self._highlighting_unloaded:
+            self._highlighting_unloaded = False
+            self.highlight_all()
+
     def _proxy(self, command, *args):
         """Thanks to Bryan Oakley on StackOverflow: https://stackoverflow.com/a/40618152/"""
         cmd = (self._orig, command) + args
+        is_edit = command in {"insert", "replace", "delete"} and bool(args)
+
+        if is_edit and self._batch_depth:
+            self._mark_edited_range(command, args)
+            self._batch_changed = True
+
+        if is_edit and self._identifier_index is not None:
+            self._shift_identifier_lines(command, args)
+
         result = self.tk.call(cmd)
 
         # Generate a <<ContentChanged>> event if the widget content was modified
+        # Inside a batch the event is generated only once, when it ends
 
         if command in {"insert", "replace", "delete"}:
-            self.event_generate("<<ContentChanged>>")
+            if self._batch_depth:
+                self.tk.call(
+                    self._orig,
+                    "tag",
+                    "add",
+                    "batch_dirty",
+                    "batch_start linestart",
+                    "batch_end lineend + 1 char",
+                )
+            else:
+                self.event_generate("<<ContentChanged>>")
 
         return result  # Returns what it would actually return
 
+    def _mark_edited_range(self, command: str, args: tuple) -> None:
+        """Sets the marks around the range that the upcoming edit will touch"""
+        start = self.tk.call(self._orig, "index", args[0])
+        at_end = self.tk.call(self._orig, "compare", start, "==", "end")
+        if self.tk.getboolean(at_end):
+            # Tk inserts the text before the last newline
+            start = self.tk.call(self._orig, "index", "end - 1 char")
+
+        end = start
+        if command != "insert" and len(args) > 1:
+            end = self.tk.call(self._orig, "index", args[1])
+
+        self.tk.call(self._orig, "mark", "set", "batch_start", start)
+        self.tk.call(self._orig, "mark", "gravity", "batch_start", "left")
+        self.tk.call(self._orig, "mark", "set", "batch_end", end)
+        self.tk.call(self._orig, "mark", "gravity", "batch_end", "right")
+
+    def _shift_identifier_lines(self, command: str, args: tuple) -> None:
+        """Keeps the lines of the identifier index in sync with the upcoming edit"""
+
+        def line_of(index: str) -> int:
+            index = self.tk.call(self._orig, "index", index)
+            if self.tk.getboolean(
+                self.tk.call(self._orig, "compare", index, "==", "end")
+            ):
+                index = self.tk.call(self._orig, "index", "end - 1 char")
+            return int(str(index).split(".")[0])
+
+        start = line_of(args[0])
+
+        if command in {"replace", "delete"}:
+            end = line_of(args[1] if len(args) > 1 else f"{args[0]} + 1 char")
+            self._identifier_index.delete_lines(start, end - start)
+
+        if command in {"replace", "insert"}:
+            chars = args[2::2] if command == "replace" else args[1::2]
+            self._identifier_index.insert_lines(
+                start, sum(text.count("\n") for text in chars)
+            )
+
+    @contextmanager
+    def batch(self):
+        """
+        Groups programmatic edits together. Events and highlighting are deferred
+        until the end of the block, then the touched lines are highlighted once,
+        a single <<ContentChanged>> event is generated, and the whole block
+        becomes one entry on the undo stack
+        """
+        self._batch_depth += 1
+        if self._batch_depth == 1:
+            autoseparators = tk.Text.cget(self, "autoseparators")
+            tk.Text.configure(self, autoseparators=False)
+            self.edit_separator()
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if not self._batch_depth:
+                self.edit_separator()
+                tk.Text.configure(self, autoseparators=autoseparators)
+                self._highlight_dirty_lines()
+                if self._batch_changed:
+                    self._batch_changed = False
+                    self.event_generate("<<ContentChanged>>")
+
+    def _highlight_dirty_lines(self) -> None:
+        """Highlights the lines that were touched during a batch"""
+        ranges = self.tag_ranges("batch_dirty")
+        self.tag_delete("batch_dirty")  # highlight_line loops over every tag
+        self.mark_unset("batch_start", "batch_end")
+
+        lines = set()
+        for start, end in zip(ranges[0::2], ranges[1::2]):
+            first = int(str(start).split(".")[0])
+            last_line, last_col = map(int, str(end).split("."))
+            lines.update(range(first, last_line + 1 if last_col else last_line))
+
+        for line in sorted(lines):
+            self.highlight_line(line=line)
+
     def insert(self, index: str, content: str):
         # FIXME: imo this method is super hacky, there should be a better solution
         line_no = int(
@@ -130,14 +401,30 @@ class BaseCodeBox(tk.Text):
         else:
             tk.Text.insert(self, index, content)
             self.highlight_line(line=line_no)
-        self.see(f"{line_no}.0")
+        if not self._batch_depth:
+            self.see(f"{line_no}.0")
         return "break"
 
     def highlight_line(self, event: tk.Event = None, line: int = None) -> None:
         """Highlights the specified or the current line"""
         if line is None:
             line = int(self.index("insert").split(".")[0])
-        line_text = self.get(f"{line}.0", f"{line}.end")
+        if self._highlighting_unloaded:
+            return
+        if self._batch_depth:
+            # Deferred until the end of the batch
+            self.tag_add("batch_dirty", f"{line}.0", f"{line}.0 lineend + 1 char")
+            return
+
+        # Lexing and tagging a huge line (eg. minified code) on every keypress
+        # would freeze the widget, so only its beginning gets highlighted
+        line_end = f"{line}.end"
+        if self._highlight_limit:
+            line_length = int(self.index(line_end).split(".")[1])
+            if line_length > self._highlight_limit:
+                line_end = f"{line}.{self._highlight_limit}"
+
+        line_text = self.get(f"{line}.0", line_end)
         start = f"{line}.0"
 
         for tag in self.tag_names(index=None):
@@ -146,13 +433,31 @@ class BaseCodeBox(tk.Text):
                 # because this method runs on every keypress
                 self.tag_remove(tag, f"{line}.0", f"{line}.end")
 
-        for token, content in pygments.lex(line_text, self._lexer()):
+        names = []
+        for token, content in self._tokenizer.tokenize(line_text):
             end = f"{start.split('.')[0]}.{int(start.split('.')[1]) + len(content)}"
-            self.tag_add(str(token), start, end)
+            tag = str(token)
+            if not self._low_memory or tag in self._styled_tags:
+                # Tags without any style would only take memory
+                self.tag_add(tag, start, end)
             start = end
+            if token in Name and content.isidentifier():
+                names.append(content)
+
+        if self._identifier_index is not None:
+            self._identifier_index.update_line(line, names)
+
+        if line_end != f"{line}.end":
+            self.tag_add("highlight_cutoff", line_end, f"{line}.end")
 
     def highlight_all(self, *_) -> None:
         """Loops through the entire content and highlights it"""
+        if self._highlighting_unloaded:
+            return
+        if self._batch_depth:
+            self.tag_add("batch_dirty", "1.0", "end")
+            return
+
         for tag in self.tag_names(index=None):
             if tag != "sel":
                 self.tag_remove(tag, "1.0", "end")
@@ -162,10 +467,24 @@ class BaseCodeBox(tk.Text):
 
         self.event_generate("<<AllHighlighted>>")
 
-    def load_from_file(self, file_name: str):
+    def load_from_file(self, file_name: str, diff: bool = False):
+        """
+        Loads the content of a file. With diff=True only the changed lines are
+        replaced, see apply_diff
+        """
         with open(file_name, "r") as file:
+            content = file.read()
+
+        self._file_name = file_name
+        if self._language and self._language.lower() == "auto":
+            self._lexer = detect_lexer(file_name, content) or TextLexer
+            self._update_tokenizer()
+
+        if diff:
+            self.apply_diff(content)
+        else:
             self.delete("1.0", "end")
-            self.insert("end", file.read())
+            self.insert("end", content)
         self.event_generate("<<TextLoadedFromFile>>")
 
     def save_to_file(
@@ -173,8 +492,107 @@ class BaseCodeBox(tk.Text):
     ):
         with open(file_name, "w") as file:
             file.write(self.get(start, end))
+        if self._watch_job and self._is_current_file(file_name):
+            self._watch_stat = self._stat_file()  # Don't reload our own changes
         self.event_generate("<<TextSavedToFile>>")
 
+    def apply_diff(self, new_content: str) -> None:
+        """
+        Changes the content to new_content by replacing only the lines that
+        differ. Unlike setting the content, this keeps the scroll position, the
+        undo history and the highlighting of the untouched lines
+        """
+        old_lines = self.get("1.0", "end - 1 char").split("\n")
+        new_lines = new_content.split("\n")
+
+        # Skipping the common beginning and end is much cheaper than diffing them
+        common = min(len(old_lines), len(new_lines))
+        prefix = 0
+        while prefix < common and old_lines[prefix] == new_lines[prefix]:
+            prefix += 1
+        suffix = 0
+        while (
+            suffix < common - prefix
+            and old_lines[-1 - suffix] == new_lines[-1 - suffix]
+        ):
+            suffix += 1
+
+        matcher = difflib.SequenceMatcher(
+            None,
+            old_lines[prefix : len(old_lines) - suffix],
+            new_lines[prefix : len(new_lines) - suffix],
+            autojunk=False,
+        )
+
+        with self.batch():
+            # Backwards, so the line numbers of the earlier hunks stay valid
+            for tag, i1, i2, j1, j2 in reversed(matcher.get_opcodes()):
+                if tag != "equal":
+                    self._replace_lines(
+                        i1 + prefix,
+                        i2 + prefix,
+                        new_lines[j1 + prefix : j2 + prefix],
+                        at_end=i2 + prefix == len(old_lines),
+                    )
+
+    def _replace_lines(self, first: int, last: int, lines: list, at_end: bool):
+        """Replaces the lines from first to last (0-based, exclusive) with lines"""
+        if not at_end:
+            tk.Text.delete(self, f"{first + 1}.0", f"{last + 1}.0")
+            tk.Text.insert(self, f"{first + 1}.0", "".join(x + "\n" for x in lines))
+        elif first:
+            # The last line has no newline after it (except Tk's own final one),
+            # so the newline at the end of the previous line is replaced instead
+            tk.Text.delete(self, f"{first}.end", "end - 1 char")
+            tk.Text.insert(self, f"{first}.end", "".join("\n" + x for x in lines))
+        else:
+            tk.Text.delete(self, "1.0", "end - 1 char")
+            tk.Text.insert(self, "1.0", "\n".join(lines))
+
+    def _is_current_file(self, file_name: str) -> bool:
+        if not self._file_name:
+            return False
+        return os.path.abspath(file_name) == os.path.abspath(self._file_name)
+
+    def _stat_file(self):
+        try:
+            stat = os.stat(self._file_name)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def watch_file(self, file_name: Union[str, None] = None, interval: int = 1000):
+        """
+        Polls the modification time and size of the file every interval
+        milliseconds, and reloads it with apply_diff when they change
+        """
+        if file_name and not self._is_current_file(file_name):
+            self.load_from_file(file_name)
+        if not self._file_name:
+            raise ValueError("No file to watch, please give a file name")
+
+        self.unwatch_file()
+        self._watch_stat = self._stat_file()
+        self._watch_job = self.after(interval, self._poll_file, interval)
+
+    def unwatch_file(self) -> None:
+        if self._watch_job:
+            self.after_cancel(self._watch_job)
+        self._watch_job, self._watch_stat = None, None
+
+    def _poll_file(self, interval: int) -> None:
+        try:
+            stat = self._stat_file()
+            if stat and stat != self._watch_stat:
+                self.load_from_file(self._file_name, diff=True)
+                self._watch_stat = stat
+                self.event_generate("<<FileChangedOnDisk>>")
+        except (OSError, UnicodeDecodeError):
+            # The file may be half written, try again on the next poll
+            pass
+        finally:
+            self._watch_job = self.after(interval, self._poll_file, interval)
+
     @property
     def content(self) -> str:
         return self.get("1.0", "end")
@@ -196,11 +614,12 @@ class BaseCodeBox(tk.Text):
         self.update_lexer(language)
 
     @property
-    def lexer(self) -> pygments.lexer.Lexer:
+    def lexer(self) -> Union[pygments.lexer.Lexer, tokenizers.Tokenizer]:
         return self._lexer
 
     @lexer.setter
-    def lexer(self, lexer: str) -> None:
+    def lexer(self, lexer: Union[type, tokenizers.Tokenizer]) -> None:
+        """Sets a Pygments lexer class, or a custom tokenizer backend"""
         self._lexer = lexer
         self.update_lexer("unknown")
 
@@ -210,6 +629,7 @@ class BaseCodeBox(tk.Text):
 
     @font_family.setter
     def font_family(self, family: str) -> None:
+        self._unshare_font()
         self._font.config(family=family)
 
     @property
@@ -218,6 +638,7 @@ class BaseCodeBox(tk.Text):
 
     @font_size.setter
     def font_size(self, size: int) -> None:
+        self._unshare_font()
         self._font.config(size=size)
 
     @property
@@ -255,6 +676,14 @@ class BaseCodeBox(tk.Text):
 
         return font_list
 
+    def _generate_tag_options(self, value: Union[str, dict]) -> dict:
+        if isinstance(value, str):
+            return {"foreground": value}
+        options = dict(value)
+        if "font" in options:
+            options["font"] = self._generate_font_list(options["font"])
+        return options
+
     def update_highlighter(self, highlighter: str) -> None:
         """Sets or changes the highlighter configuration"""
         highlight_file = highlighter
@@ -267,27 +696,44 @@ class BaseCodeBox(tk.Text):
                 package_path, "schemes", highlighter + ".json"
             )
         try:
-            with open(highlight_file) as file:
-                self.configuration = json.load(file)
+            modified = os.stat(highlight_file).st_mtime_ns
         except FileNotFoundError:
             raise FileNotFoundError(
                 f"Style configuration file not found: '{highlight_file}'"
             )
 
-        general_props = self.configuration.pop("general")
-        selection_props = self.configuration.pop("selection")
-        syntax_props = self.configuration.pop("syntax")
+        # Reload the scheme if the file was edited since it got cached
+        cached = _schemes.get(highlight_file)
+        if cached is None or cached[0] != modified:
+            with open(highlight_file) as file:
+                cached = _schemes[highlight_file] = (modified, json.load(file))
+        self.configuration = cached[1]  # Shared, don't modify it
+
+        general_props = self.configuration["general"]
+        selection_props = self.configuration["selection"]
+        syntax_props = self.configuration["syntax"]
 
         self.config(**general_props)
         self.tag_configure("sel", **selection_props)
 
-        for key, value in syntax_props.items():
-            if isinstance(value, str):
-                self.tag_configure(key, foreground=value)
-            else:
-                if "font" in value:
-                    value["font"] = self._generate_font_list(value["font"])
-                self.tag_configure(key, **value)
+        # The part of too long lines that isn't highlighted looks like a comment
+        comment = syntax_props.get("Token.Comment", {})
+        if isinstance(comment, dict):
+            comment = comment.get("foreground", "")
+        self.tag_configure("highlight_cutoff", foreground=comment)
+
+        options_key = (highlight_file, modified, self.font_family, self.font_size)
+        if options_key not in _syntax_options:
+            _syntax_options[options_key] = {
+                key: self._generate_tag_options(value)
+                for key, value in syntax_props.items()
+            }
+
+        for key, value in _syntax_options[options_key].items():
+            self.tag_configure(key, **value)
+        self._styled_tags = frozenset(syntax_props) | {"highlight_cutoff"}
+
+        self.tag_raise("highlight_cutoff")
 
         if self._highlighter:  # Don't generate event on init
             self.event_generate("<<HighlighterChanged>>")
@@ -301,6 +747,7 @@ class BaseCodeBox(tk.Text):
             return
 
         self._set_lexer(language.lower())
+        self._update_tokenizer()
 
         if self._language:  # Don't generate event on init
             self.event_generate("<<LanguageChanged>>")
@@ -308,8 +755,31 @@ class BaseCodeBox(tk.Text):
         self._language = language
         self.highlight_all()
 
+    def _check_tokenizer_backend(self, backend: str) -> str:
+        if backend not in {"pygments", "regex"}:
+            raise ValueError(
+                f"Invalid tokenizer '{backend}', it should be 'pygments' or 'regex'"
+            )
+        return backend
+
+    def _update_tokenizer(self) -> None:
+        """Picks the tokenizer backend for the current lexer"""
+        if isinstance(self._lexer, tokenizers.Tokenizer):
+            self._tokenizer = self._lexer
+        elif (
+            self._tokenizer_backend == "regex"
+            and self._lexer in tokenizers.REGEX_TOKENIZERS
+        ):
+            self._tokenizer = tokenizers.REGEX_TOKENIZERS[self._lexer]
+        else:
+            # The regex backend falls back to Pygments for the other languages
+            self._tokenizer = tokenizers.PygmentsTokenizer(self._lexer)
+
     def _set_lexer(self, lang):
-        if lang == "ada":
+        if lang == "auto":
+            sample = self.get("1.0", f"1.0 + {GUESS_SAMPLE_SIZE} chars")
+            self._lexer = detect_lexer(self._file_name, sample) or TextLexer
+        elif lang == "ada":
             self._lexer = AdaLexer
         elif lang == "bash":
             self._lexer = BashLexer
@@ -405,11 +875,20 @@ class BaseCodeBox(tk.Text):
         if not self.winfo_exists():
             return f"<destroyed {result}>"
 
-        return f"<{result}, color scheme: {self._highlighter!r}, lexer: {self._lexer.__name__}>"
+        return f"<{result}, color scheme: {self._highlighter!r}, lexer: {self._tokenizer.name}>"
 
     def keys(self) -> list:
         keys = tk.Text.keys(self)
-        keys.extend(["autofocus", "highlighter", "language"])
+        keys.extend(
+            [
+                "autofocus",
+                "highlight_limit",
+                "highlighter",
+                "language",
+                "low_memory",
+                "tokenizer",
+            ]
+        )
         return sorted(keys)
 
     def cget(self, key: str):
@@ -417,12 +896,27 @@ class BaseCodeBox(tk.Text):
             return self._highlighter
         elif key == "language":
             return self._language
+        elif key == "highlight_limit":
+            return self._highlight_limit
+        elif key == "tokenizer":
+            return self._tokenizer_backend
+        elif key == "low_memory":
+            return self._low_memory
         else:
             return tk.Text.cget(self, key)
 
     def configure(self, **kwargs) -> None:
         lang = kwargs.pop("language", None)
         highlighter = kwargs.pop("highlighter", None)
+        highlight_limit = kwargs.pop("highlight_limit", None)
+        tokenizer = kwargs.pop("tokenizer", None)
+        if tokenizer:
+            self._tokenizer_backend = self._check_tokenizer_backend(tokenizer)
+            self._update_tokenizer()
+            self.highlight_all()
+        if highlight_limit is not None:
+            self._highlight_limit = highlight_limit
+            self.highlight_all()
         if lang:
             self.update_lexer(lang)
         if highlighter:
@@ -442,7 +936,13 @@ class BaseCodeBox(tk.Text):
 
     def destroy(self):
         """Destroys this widget"""
-        # Explicit tcl calls are needed to avoid recursion error
-        for i in self.frame.children.values():
-            self.tk.call("destroy", i._w)
-        self.tk.call("destroy", self.frame._w)
+        self.unwatch_file()
+        self._unbind_map_events()
+        # Destroying the text first removes it from the frame's children,
+        # so destroying the frame doesn't call this method again
+        tk.BaseWidget.destroy(self)
+        try:
+            self.tk.deletecommand(self._w)  # Tk only deletes the original command
+        except tk.TclError:
+            pass
+        self.frame.destroy()
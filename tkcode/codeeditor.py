@@ -4,10 +4,12 @@ License: GNU GPLv3
 Copyright: 2021 rdbende
 """
 
+import re
 import tkinter as tk
 from tkinter import ttk
+from typing import List, Union
 
-from . import codebox
+from . import codebox, completion
 
 
 class CodeEditor(codebox.BaseCodeBox):
@@ -17,6 +19,7 @@ class CodeEditor(codebox.BaseCodeBox):
         language="python",
         highlighter="mariana",
         autofocus=False,
+        autocomplete=True,
         **kwargs,
     ):
 
@@ -51,6 +54,105 @@ class CodeEditor(codebox.BaseCodeBox):
         except tk.TclError:
             pass
 
+        self.completion_popup = None
+        if autocomplete:
+            self._setup_autocompletion()
+
+    def _setup_autocompletion(self):
+        self._identifier_index = completion.IdentifierIndex()
+        self._completion_job = None
+        self._completion_chosen = False
+        self.completion_popup = completion.CompletionPopup(
+            self, font=self._font, borderwidth=0, highlightthickness=1
+        )
+        self._style_completion_popup()
+
+        self.bind("<KeyRelease>", self._schedule_completions, add=True)
+        self.bind("<<HighlighterChanged>>", self._style_completion_popup, add=True)
+        self.bind("<Button-1>", self.hide_completions, add=True)
+        self.bind("<Escape>", self.hide_completions, add=True)
+        self.bind("<Up>", lambda _: self._move_completion(-1), add=True)
+        self.bind("<Down>", lambda _: self._move_completion(1), add=True)
+        self.bind("<Tab>", self.insert_completion, add=True)
+        self.bind("<Return>", self._insert_chosen_completion, add=True)
+        self.completion_popup.bind("<ButtonRelease-1>", self.insert_completion)
+
+    def _style_completion_popup(self, *_):
+        self.completion_popup.configure(
+            background=self["background"],
+            foreground=self["foreground"],
+            highlightbackground=self["foreground"],
+            selectbackground=self.tag_cget("sel", "background"),
+            selectforeground=self.tag_cget("sel", "foreground"),
+        )
+
+    def _schedule_completions(self, event: tk.Event):
+        """Looks up the completions when Tk is idle, so typing is never blocked"""
+        if event.keysym in {"Up", "Down", "Tab", "Return", "Escape"}:
+            return
+
+        if self._completion_job:
+            self.after_cancel(self._completion_job)
+        self._completion_job = self.after_idle(self.show_completions)
+
+    @property
+    def _word_before_cursor(self) -> str:
+        match = re.search(r"\w+$", self.get("insert linestart", "insert"))
+        return match.group() if match and not match.group()[0].isdigit() else ""
+
+    def completions(
+        self, prefix: Union[str, None] = None, limit: int = 10
+    ) -> List[str]:
+        """Returns the completions of the prefix, or of the word before the cursor"""
+        if self._identifier_index is None:
+            return []
+        if prefix is None:
+            prefix = self._word_before_cursor
+        return self._identifier_index.complete(prefix, limit) if prefix else []
+
+    def show_completions(self, *_):
+        """Shows the completions of the word before the cursor"""
+        self._completion_job = None
+        self._completion_chosen = False
+        self.completion_popup.show(self.completions())
+
+    def hide_completions(self, *_):
+        if self.completion_popup:
+            self.completion_popup.hide()
+
+    def _move_completion(self, step: int):
+        if not self.completion_popup.is_visible:
+            return None
+        self.completion_popup.move(step)
+        self._completion_chosen = True
+        return "break"
+
+    def _insert_chosen_completion(self, *_):
+        """
+        Return only inserts a completion that was chosen with Up or Down,
+        otherwise it inserts a newline as usual
+        """
+        if not self._completion_chosen:
+            self.hide_completions()
+            return None
+        return self.insert_completion()
+
+    def insert_completion(self, *_):
+        """Completes the word before the cursor with the selected completion"""
+        if not self.completion_popup.is_visible:
+            return None
+
+        word = self.completion_popup.selected
+        prefix = self._word_before_cursor
+        self.hide_completions()
+        if word.startswith(prefix):
+            self.insert("insert", word[len(prefix) :])
+
+        # Clicking the popup focuses it, but typing should go on in the editor
+        self.focus_set()
+        self.event_generate("<<CompletionInserted>>")
+        return "break"
+
     def paste(self, *_):
         """Handles text pasting"""
         if self.tag_ranges("sel"):
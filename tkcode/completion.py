@@ -0,0 +1,149 @@
+"""
+Author: rdbende
+License: GNU GPLv3
+Copyright: 2021 rdbende
+"""
+
+import heapq
+import tkinter as tk
+from bisect import bisect_left, insort
+from typing import Iterable, List
+
+
+class IdentifierIndex:
+    """
+    Keeps track of the identifiers in a text, line by line. Every identifier has
+    a reference count, so changing a line only touches the identifiers of that
+    line, and a sorted list of the distinct identifiers makes prefix lookups fast
+    """
+
+    def __init__(self) -> None:
+        self._lines = []  # The identifiers of every line, line 1 is at index 0
+        self._counts = {}
+        self._sorted = []
+
+    def _add(self, words: Iterable[str]) -> None:
+        for word in words:
+            count = self._counts.get(word, 0)
+            if not count:
+                insort(self._sorted, word)
+            self._counts[word] = count + 1
+
+    def _remove(self, words: Iterable[str]) -> None:
+        for word in words:
+            count = self._counts[word] - 1
+            if count:
+                self._counts[word] = count
+            else:
+                del self._counts[word]
+                del self._sorted[bisect_left(self._sorted, word)]
+
+    def update_line(self, line: int, words: Iterable[str]) -> None:
+        """Replaces the identifiers of a line"""
+        if line < 1:
+            return
+
+        if line > len(self._lines):
+            self._lines.extend([()] * (line - len(self._lines)))
+
+        words = tuple(words)
+        self._remove(self._lines[line - 1])
+        self._add(words)
+        self._lines[line - 1] = words
+
+    def insert_lines(self, line: int, count: int) -> None:
+        """Shifts the lines when new lines are inserted after the given line"""
+        if count and line <= len(self._lines):
+            self._lines[line:line] = [()] * count
+
+    def delete_lines(self, line: int, count: int) -> None:
+        """Forgets the lines that got merged into the given line"""
+        for words in self._lines[line : line + count]:
+            self._remove(words)
+        del self._lines[line : line + count]
+
+    def clear(self) -> None:
+        self._lines.clear()
+        self._counts.clear()
+        self._sorted.clear()
+
+    def complete(self, prefix: str, limit: int = 10) -> List[str]:
+        """
+        Returns the most common identifiers that start with the prefix. The cost is
+        linear in the number of matches: a one character prefix on ~100k distinct
+        identifiers takes a few tenths of a millisecond, longer prefixes only
+        microseconds
+        """
+        start = bisect_left(self._sorted, prefix)
+        end = bisect_left(self._sorted, prefix + "\U0010ffff", start)
+        matches = (word for word in self._sorted[start:end] if word != prefix)
+
+        # nlargest is stable, so equally common words stay alphabetical
+        return heapq.nlargest(limit, matches, key=self._counts.__getitem__)
+
+    def __contains__(self, word: str) -> bool:
+        return word in self._counts
+
+    def __len__(self) -> int:
+        return len(self._sorted)
+
+
+class CompletionPopup(tk.Listbox):
+    """
+    A list of completions that is placed under the insertion cursor of a text
+    widget. It isn't in the keyboard traversal, so the user can keep typing
+    """
+
+    def __init__(self, text: tk.Text, **kwargs) -> None:
+        self.text = text
+        tk.Listbox.__init__(
+            self,
+            text.master,
+            activestyle="none",
+            exportselection=False,
+            takefocus=False,
+            height=8,
+            **kwargs,
+        )
+
+    @property
+    def is_visible(self) -> bool:
+        return bool(self.place_info())
+
+    def show(self, completions: List[str]) -> None:
+        bbox = self.text.bbox("insert")
+        if not completions or not bbox:
+            self.hide()
+            return
+
+        self.delete(0, "end")
+        self.insert("end", *completions)
+        self.configure(
+            height=min(len(completions), 8),
+            width=max(len(word) for word in completions) + 1,
+        )
+        self.select_item(0)
+
+        x, y, _, height = bbox
+        self.place(in_=self.text, x=x, y=y + height, bordermode="outside", anchor="nw")
+
+    def hide(self) -> None:
+        self.place_forget()
+
+    def select_item(self, index: int) -> None:
+        size = self.size()
+        if not size:
+            return
+        index %= size
+        self.selection_clear(0, "end")
+        self.selection_set(index)
+        self.see(index)
+
+    def move(self, step: int) -> None:
+        selection = self.curselection()
+        self.select_item((selection[0] if selection else -step) + step)
+
+    @property
+    def selected(self) -> str:
+        selection = self.curselection()
+        return self.get(selection[0]) if selection else ""
@@ -0,0 +1,287 @@
+"""
+Author: rdbende
+License: GNU GPLv3
+Copyright: 2021 rdbende
+"""
+
+import builtins
+import keyword
+import re
+from abc import ABC, abstractmethod
+from typing import Iterator, Tuple
+
+import pygments
+from pygments.lexers import CLexer, JsonLexer, PythonLexer, YamlLexer
+from pygments.token import (
+    Comment,
+    Error,
+    Keyword,
+    Literal,
+    Name,
+    Number,
+    Operator,
+    Punctuation,
+    String,
+    Text,
+    Whitespace,
+    _TokenType,
+)
+
+
+class Tokenizer(ABC):
+    """
+    Base class of the tokenizer backends. A backend splits a piece of text
+    into (token type, value) pairs, just like pygments.lex does, and the values
+    must add up to the whole text
+    """
+
+    name = "Tokenizer"
+
+    @abstractmethod
+    def tokenize(self, text: str) -> Iterator[Tuple[_TokenType, str]]: ...
+
+
+class PygmentsTokenizer(Tokenizer):
+    """Tokenizes with a Pygments lexer class, this is the default backend"""
+
+    def __init__(self, lexer: type) -> None:
+        self.lexer = lexer
+        self.name = lexer.__name__
+
+    def tokenize(self, text: str) -> Iterator[Tuple[_TokenType, str]]:
+        return pygments.lex(text, self.lexer())
+
+
+class RegexTokenizer(Tokenizer):
+    """
+    Tokenizes in a single pass with one precompiled regular expression.
+    The rules are (regex, token type) pairs, tried in order at every position.
+    Like Pygments' bygroups, the token type can be a tuple, then every
+    capturing group of the regex gets the token type at the same index
+    """
+
+    def __init__(self, name: str, rules: list, flags: int = 0) -> None:
+        self.name = name
+
+        patterns = []
+        self._actions = {}
+        group_index = 1
+        for regex, action in rules:
+            patterns.append(f"({regex})")
+            self._actions[group_index] = action
+            group_index += re.compile(regex).groups + 1
+
+        # Anything that isn't matched by the rules
+        patterns.append(r"([\s\S])")
+        self._actions[group_index] = Error
+
+        self._regex = re.compile("|".join(patterns), flags)
+
+    def tokenize(self, text: str) -> Iterator[Tuple[_TokenType, str]]:
+        actions = self._actions
+        for match in self._regex.finditer(text):
+            index = match.lastindex
+            action = actions[index]
+            if isinstance(action, _TokenType):  # Token types are tuples too
+                yield action, match.group()
+            else:
+                for offset, token in enumerate(action, start=1):
+                    value = match.group(index + offset)
+                    if value:
+                        yield token, value
+
+
+def _words(words) -> str:
+    # The longest first, so a word never shadows another one it's a prefix of
+    return "(?:" + "|".join(sorted(words, key=len, reverse=True)) + r")\b"
+
+
+_DOUBLE_QUOTED = r'"(?:\\.|[^\\"\n])*"?'
+_SINGLE_QUOTED = r"'(?:\\.|[^\\'\n])*'?"
+
+_PYTHON_EXCEPTIONS = [
+    name
+    for name, value in vars(builtins).items()
+    if isinstance(value, type) and issubclass(value, BaseException)
+]
+_PYTHON_BUILTINS = [
+    name
+    for name, value in vars(builtins).items()
+    if callable(value) and name not in _PYTHON_EXCEPTIONS and not name.startswith("_")
+]
+_PYTHON_KEYWORDS = """
+assert async await break continue del elif else except finally for global if lambda
+nonlocal pass raise return try while with yield as def class
+""".split()
+_PYTHON_MAGIC_VARIABLES = """
+__annotations__ __bases__ __class__ __closure__ __code__ __defaults__ __dict__
+__doc__ __file__ __func__ __globals__ __kwdefaults__ __module__ __mro__ __name__
+__objclass__ __qualname__ __self__ __slots__ __weakref__
+""".split()
+# match and case are only keywords at the start of a statement, and not when
+# they are followed by something that makes them a name, like Pygments does
+_PYTHON_SOFT_KEYWORD = (
+    r"(?:^|(?<=\n))([ \t]*)(match|case)\b(?![ \t]*(?:[:,;=^&|@~)\]}]|(?:"
+    + "|".join(word for word in keyword.kwlist if word[0].islower())
+    + r")\b))"
+)
+_STRING_PREFIX = r"([rRbBuUfF]{0,2})"
+
+python_tokenizer = RegexTokenizer(
+    "PythonRegexTokenizer",
+    [
+        (r"#.*", Comment.Single),
+        (
+            _STRING_PREFIX + r'("""(?:\\[\s\S]|[^\\])*?(?:"""|$))',
+            (String.Affix, String.Double),
+        ),
+        (
+            _STRING_PREFIX + r"('''(?:\\[\s\S]|[^\\])*?(?:'''|$))",
+            (String.Affix, String.Single),
+        ),
+        (_STRING_PREFIX + f"({_DOUBLE_QUOTED})", (String.Affix, String.Double)),
+        (_STRING_PREFIX + f"({_SINGLE_QUOTED})", (String.Affix, String.Single)),
+        (r"@\w+", Name.Decorator),
+        (r"(def)(\s+)(__\w+__)\b", (Keyword, Whitespace, Name.Function.Magic)),
+        (r"(def)(\s+)(\w+)", (Keyword, Whitespace, Name.Function)),
+        (r"(class)(\s+)(\w+)", (Keyword, Whitespace, Name.Class)),
+        (
+            r"(from)(\s+)([\w.]+)(\s+)(import)\b",
+            (
+                Keyword.Namespace,
+                Whitespace,
+                Name.Namespace,
+                Whitespace,
+                Keyword.Namespace,
+            ),
+        ),
+        (r"(import)(\s+)([\w.]+)", (Keyword.Namespace, Whitespace, Name.Namespace)),
+        (_PYTHON_SOFT_KEYWORD, (Text, Keyword)),
+        # Attributes are never keywords or builtins
+        (
+            f"(\\.)(\\s*)({_words(_PYTHON_MAGIC_VARIABLES)})",
+            (Operator, Whitespace, Name.Variable.Magic),
+        ),
+        (r"(\.)(\s*)(__\w+__)\b", (Operator, Whitespace, Name.Function.Magic)),
+        (r"(\.)(\s*)([^\W\d]\w*)", (Operator, Whitespace, Name)),
+        (_words(_PYTHON_KEYWORDS), Keyword),
+        (_words(["True", "False", "None"]), Keyword.Constant),
+        (_words(["and", "or", "not", "in", "is"]), Operator.Word),
+        (_words(["self", "cls"]), Name.Builtin.Pseudo),
+        (_words(_PYTHON_EXCEPTIONS), Name.Exception),
+        (_words(_PYTHON_BUILTINS), Name.Builtin),
+        (_words(_PYTHON_MAGIC_VARIABLES), Name.Variable.Magic),
+        (r"__\w+__\b", Name.Variable.Magic),
+        (r"0[xX][\da-fA-F_]+\b", Number.Hex),
+        (r"0[bB][01_]+\b", Number.Bin),
+        (r"0[oO][0-7_]+\b", Number.Oct),
+        (
+            r"(?:\d[\d_]*\.[\d_]*|\.\d[\d_]*)(?:[eE][+-]?\d[\d_]*)?[jJ]?"
+            r"|\d[\d_]*(?:[eE][+-]?\d[\d_]*[jJ]?|[jJ])",
+            Number.Float,
+        ),
+        (r"\d[\d_]*", Number.Integer),
+        (r"\*\*=?|//=?|<<=?|>>=?|->|:=|[-+*/%&|^~<>=!@]=?|\.", Operator),
+        (r"[()\[\]{},:;]", Punctuation),
+        (r"\w+", Name),
+        (r"\n", Whitespace),
+        (r"[^\S\n]+|\\", Text),
+    ],
+)
+
+json_tokenizer = RegexTokenizer(
+    "JsonRegexTokenizer",
+    [
+        (r"\s+", Whitespace),
+        (f"({_DOUBLE_QUOTED})(\\s*)(:)", (Name.Tag, Whitespace, Punctuation)),
+        (_DOUBLE_QUOTED, String.Double),
+        (r"-?(?:0|[1-9]\d*)(?:\.\d+(?:[eE][+-]?\d+)?|[eE][+-]?\d+)", Number.Float),
+        (r"-?\d+", Number.Integer),
+        (_words(["true", "false", "null"]), Keyword.Constant),
+        (r"[{}\[\],:]+", Punctuation),
+        (r"//.*", Comment.Single),
+        (r"/\*[\s\S]*?(?:\*/|$)", Comment.Multiline),
+    ],
+)
+
+_YAML_PLAIN = r"[^\s#,\[\]{}:'\"][^\s,\[\]{}]*"
+
+yaml_tokenizer = RegexTokenizer(
+    "YamlRegexTokenizer",
+    [
+        (r"^(?:---|\.\.\.)(?=\s|$)", Name.Namespace),
+        (r"\s+", Whitespace),
+        (r"#.*", Comment.Single),
+        (r"[-?](?=\s|$)", Punctuation.Indicator),
+        (
+            f"({_YAML_PLAIN}(?:[^\\S\\n]+{_YAML_PLAIN})*?)([^\\S\\n]*)(:)(?=\\s|$)",
+            (Name.Tag, Whitespace, Punctuation),
+        ),
+        (
+            f"({_DOUBLE_QUOTED}|{_SINGLE_QUOTED})([^\\S\\n]*)(:)(?=\\s|$)",
+            (String, Whitespace, Punctuation.Indicator),
+        ),
+        (r"&[^\s,\[\]{}]+", Name.Label),
+        (r"\*[^\s,\[\]{}]+", Name.Variable),
+        (r"![^\s,\[\]{}]*", Keyword.Type),
+        (_DOUBLE_QUOTED, String),
+        (_SINGLE_QUOTED, String),
+        (r"[|>][-+\d]*(?=\s|$)", Punctuation.Indicator),
+        (r"[\[\]{},:]", Punctuation.Indicator),
+        (f"{_YAML_PLAIN}(?:[^\\S\\n]+(?!#){_YAML_PLAIN})*", Literal.Scalar.Plain),
+    ],
+    re.MULTILINE,
+)
+
+_C_TYPES = """
+_Bool _Complex bool char double float int long short signed unsigned void size_t
+ssize_t int8_t int16_t int32_t int64_t uint8_t uint16_t uint32_t uint64_t
+""".split()
+_C_KEYWORDS = """
+auto break case const continue default do else enum extern for goto if inline
+register restrict return sizeof static struct switch typedef union volatile while
+""".split()
+
+c_tokenizer = RegexTokenizer(
+    "CRegexTokenizer",
+    [
+        (r"\n", Whitespace),
+        (r"[^\S\n]+", Whitespace),
+        (r"//.*", Comment.Single),
+        (r"/\*[\s\S]*?(?:\*/|$)", Comment.Multiline),
+        (
+            r'(#[^\S\n]*include)([^\S\n]*)(<[^>\n]*>?|"[^"\n]*"?)',
+            (Comment.Preproc, Whitespace, Comment.PreprocFile),
+        ),
+        (r"#.*", Comment.Preproc),
+        (r"[LuU8]{0,2}" + _DOUBLE_QUOTED, String),
+        (r"[LuU8]{0,2}" + _SINGLE_QUOTED, String.Char),
+        (
+            f"({_words(_C_TYPES)})(\\s+)(\\**)(\\s*)(\\w+)(?=\\s*\\()",
+            (Keyword.Type, Whitespace, Operator, Whitespace, Name.Function),
+        ),
+        (_words(_C_TYPES), Keyword.Type),
+        (_words(_C_KEYWORDS), Keyword),
+        (_words(["NULL", "true", "false"]), Name.Builtin),
+        (r"0[xX][\da-fA-F]+[uUlL]*", Number.Hex),
+        (r"0[bB][01]+[uUlL]*", Number.Bin),
+        (
+            r"(?:\d+\.\d*|\.\d+)(?:[eE][+-]?\d+)?[fFlL]?|\d+[eE][+-]?\d+[fFlL]?",
+            Number.Float,
+        ),
+        (r"0[0-7]+[uUlL]*", Number.Oct),
+        (r"\d+[uUlL]*", Number.Integer),
+        (r"->|\+\+|--|<<=?|>>=?|&&|\|\||[-+*/%&|^~<>=!]=?|[?:.]", Operator),
+        (r"[()\[\]{},;]", Punctuation),
+        (r"\w+", Name),
+        (r"\\", Text),
+    ],
+)
+
+# The Pygments lexers that have a faster built-in regex tokenizer
+REGEX_TOKENIZERS = {
+    PythonLexer: python_tokenizer,
+    JsonLexer: json_tokenizer,
+    YamlLexer: yaml_tokenizer,
+    CLexer: c_tokenizer,
+}